@@ -0,0 +1,14 @@
+-- Indexes backing the ownership queries of the WebODM Task Ownership API.
+--
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so apply
+-- this file with psql in its default autocommit mode:
+--
+--   psql -h db -U postgres -d webodm_dev -f migrations/001_ownership_indexes.sql
+
+-- Per (project, user) permission counts used to find task owners
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_puop_cont_user_perm
+    ON app_projectuserobjectpermission (content_object_id, user_id, permission_id);
+
+-- Per (project, group) permissions used by the access check
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_pgop_cont_group_perm
+    ON app_projectgroupobjectpermission (content_object_id, group_id, permission_id);
@@ -0,0 +1,75 @@
+-- Precomputed result of the /api/tasks/ownership query.
+--
+-- The API refreshes the view in the background every
+-- OWNERSHIP_VIEW_REFRESH_INTERVAL seconds; set the interval to 0 to refresh it
+-- with pg_cron instead, e.g.
+--
+--   SELECT cron.schedule('*/1 * * * *', 'REFRESH MATERIALIZED VIEW CONCURRENTLY task_ownership_mv');
+--
+-- days_since_processed is not stored; it is computed when the view is read.
+--
+-- The SELECT must match _OWNERSHIP_SQL in webodm-task-ownership-api.py, and
+-- the status CASE must match _STATUS_MAP there; otherwise the view and the
+-- ?fresh=true live query drift apart. Recreate the view after changing either.
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS task_ownership_mv AS
+WITH owners AS (
+    SELECT 
+        puop.content_object_id AS project_id,
+        puop.user_id,
+        COUNT(DISTINCT perm.codename) AS permission_count,
+        string_agg(DISTINCT perm.codename, ', ') AS permissions
+    FROM 
+        app_projectuserobjectpermission puop
+    JOIN 
+        auth_permission perm ON puop.permission_id = perm.id
+    GROUP BY 
+        puop.content_object_id, puop.user_id
+    HAVING 
+        COUNT(DISTINCT perm.codename) >= 4  -- Users with all permissions are likely owners
+),
+user_groups AS (
+    SELECT 
+        ug.user_id,
+        string_agg(DISTINCT g.name, ', ') AS group_memberships
+    FROM 
+        auth_user_groups ug
+    JOIN 
+        auth_group g ON ug.group_id = g.id
+    GROUP BY 
+        ug.user_id
+)
+SELECT 
+    t.id AS task_id,
+    t.uuid AS task_uuid,
+    t.name AS task_name,
+    t.created_at AS processing_date,
+    t.status AS task_status,
+    CASE t.status
+        WHEN 10 THEN 'QUEUED'
+        WHEN 20 THEN 'RUNNING'
+        WHEN 30 THEN 'FAILED'
+        WHEN 40 THEN 'COMPLETED'
+        WHEN 50 THEN 'CANCELED'
+        ELSE 'Unknown (' || COALESCE(t.status::text, 'None') || ')'
+    END AS status_name,
+    p.id AS project_id,
+    p.name AS project_name,
+    u.username AS probable_owner,
+    o.permission_count,
+    o.permissions,
+    ug.group_memberships
+FROM 
+    app_task t
+JOIN 
+    app_project p ON t.project_id = p.id
+JOIN 
+    owners o ON o.project_id = p.id
+JOIN 
+    auth_user u ON o.user_id = u.id
+LEFT JOIN
+    user_groups ug ON ug.user_id = u.id;
+
+-- Required by REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS task_ownership_mv_task_owner
+    ON task_ownership_mv (task_id, probable_owner);
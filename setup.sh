@@ -23,5 +23,6 @@ echo "WebODM Task API is now running on http://localhost:8899/docs"
 echo "Try accessing these endpoints:"
 echo "- http://localhost:8899/api/tasks/ownership"
 echo "- http://localhost:8899/api/tasks/status"
+echo "- http://localhost:8899/api/tasks/owners?ids={task_id}&ids={task_id}"
 echo "- http://localhost:8899/api/tasks/{task_id}/owner"
 echo "- http://localhost:8899/api/tasks/{task_id}/check-access/{username}"
@@ -1,21 +1,41 @@
-from fastapi import FastAPI, Depends, HTTPException
-import psycopg2
-from psycopg2.extras import RealDictCursor
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from psycopg.conninfo import make_conninfo
+from psycopg.rows import class_row, dict_row
+from psycopg_pool import AsyncConnectionPool
 from pydantic import BaseModel
+import redis.asyncio as redis
+import orjson
+from starlette.background import BackgroundTask
+from starlette.routing import Match
+from types import MappingProxyType
 from typing import List, Optional
+from uuid import UUID
 import os
+import sys
 from dotenv import load_dotenv
 import uvicorn
-from datetime import datetime, timezone
+import asyncio
+import contextlib
+import hashlib
+import logging
+import queue
+import time
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 
 
 # Load environment variables from .env file
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 app = FastAPI(
     title="WebODM Task Ownership API",
     description="API for checking task ownership and permissions in WebODM",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 # Database connection parameters from environment variables
@@ -23,46 +43,582 @@ DB_PARAMS = {
     "dbname": os.getenv("DB_NAME", "webodm_dev"),
     "user": os.getenv("DB_USER", "postgres"),
     "password": os.getenv("DB_PASSWORD", "postgres"),
-    "host": os.getenv("DB_HOST", "db"),
-    "port": os.getenv("DB_PORT", "5432"),
+    "host": os.getenv("DB_HOST", "pgbouncer"),
+    "port": os.getenv("DB_PORT", "6432"),
 }
 
-def get_db_connection():
-    """Establish a connection to the PostgreSQL database"""
+# Connection pool sizing, shared by all requests handled by this process
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "5"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "40"))
+# Seconds a request waits for a free connection before failing
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+
+# PgBouncer runs in transaction pooling mode, so no transaction may be left
+# open between statements and no session state may be relied upon. Statements
+# are only prepared where asked for with prepare=True; PgBouncer tracks those
+# protocol-level prepared statements across server connections
+# (max_prepared_statements). A threshold of None would disable prepare=True
+# too, so automatic preparation is kept out of reach with an unreachable one
+DB_PREPARE_THRESHOLD = sys.maxsize
+
+POOL = None
+
+@app.on_event("startup")
+async def open_pool():
+    """Create the database connection pool on the server's event loop"""
+    global POOL
+    POOL = AsyncConnectionPool(
+        make_conninfo(**DB_PARAMS),
+        min_size=DB_POOL_MIN,
+        max_size=DB_POOL_MAX,
+        timeout=DB_POOL_TIMEOUT,
+        kwargs={"autocommit": True, "prepare_threshold": DB_PREPARE_THRESHOLD},
+        open=False,
+    )
+    await POOL.open()
+    global OWNERSHIP_VIEW_TASK
+    OWNERSHIP_VIEW_TASK = asyncio.create_task(maintain_ownership_view())
+
+@app.on_event("shutdown")
+async def close_pool():
+    """Close every connection held by the pool"""
+    if OWNERSHIP_VIEW_TASK is not None:
+        # Wait for an in-flight refresh to stop before its connection is closed
+        OWNERSHIP_VIEW_TASK.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await OWNERSHIP_VIEW_TASK
+    if POOL is not None:
+        await POOL.close()
+
+async def get_conn():
+    """Borrow a connection from the pool for the duration of a request"""
     try:
-        conn = psycopg2.connect(**DB_PARAMS)
-        return conn
+        conn = await POOL.getconn()
     except Exception as e:
-        print(f"Database connection error: {e}")
+        logger.exception("Database connection failed")
         raise HTTPException(status_code=500, detail=f"Database connection error: {str(e)}")
+    try:
+        yield conn
+    finally:
+        # Connections broken by a server restart are discarded by the pool
+        await POOL.putconn(conn)
+
+# work_mem for the queries that list every task. The default 4MB makes their
+# final sort by task id spill to temporary files once tenants grow
+DB_LISTING_WORK_MEM = os.getenv("DB_LISTING_WORK_MEM", "32MB")
+
+async def use_listing_work_mem(conn):
+    """Raise work_mem for the rest of the current transaction only"""
+    await conn.execute("SELECT set_config('work_mem', %s, true)", (DB_LISTING_WORK_MEM,))
+
+# Seconds between refreshes of task_ownership_mv, 0 leaves refreshing to pg_cron
+OWNERSHIP_VIEW_REFRESH_INTERVAL = int(os.getenv("OWNERSHIP_VIEW_REFRESH_INTERVAL", "60"))
+
+# Whether task_ownership_mv (migrations/002_task_ownership_mv.sql) exists
+OWNERSHIP_VIEW_READY = False
+OWNERSHIP_VIEW_TASK = None
+
+async def maintain_ownership_view():
+    """Keep task_ownership_mv refreshed while the view exists"""
+    global OWNERSHIP_VIEW_READY
+    while True:
+        try:
+            async with POOL.connection() as conn:
+                cursor = await conn.execute("SELECT to_regclass('task_ownership_mv') IS NOT NULL")
+                OWNERSHIP_VIEW_READY = (await cursor.fetchone())[0]
+                if OWNERSHIP_VIEW_READY and OWNERSHIP_VIEW_REFRESH_INTERVAL > 0:
+                    async with conn.pipeline():
+                        async with conn.transaction():
+                            await use_listing_work_mem(conn)
+                            await conn.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY task_ownership_mv")
+        except Exception:
+            logger.exception("Materialized view refresh failed")
+        await asyncio.sleep(OWNERSHIP_VIEW_REFRESH_INTERVAL or 60)
+
+# Redis instance used to cache responses of the read-only endpoints
+REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
+
+# Cache lifetimes in seconds
+CACHE_TTL_SHORT = int(os.getenv("CACHE_TTL_SHORT", "5"))
+CACHE_TTL_NORMAL = int(os.getenv("CACHE_TTL_NORMAL", "15"))
+CACHE_TTL_LONG = int(os.getenv("CACHE_TTL_LONG", "60"))
+# How long an expired response is kept to be served when the database fails
+CACHE_STALE_BUFFER = int(os.getenv("CACHE_STALE_BUFFER", "300"))
+
+REDIS = None
+
+@app.on_event("startup")
+async def open_redis():
+    """Create the Redis client on the server's event loop"""
+    global REDIS
+    REDIS = redis.Redis.from_url(REDIS_URL, socket_connect_timeout=1, socket_timeout=1)
+
+@app.on_event("shutdown")
+async def close_redis():
+    """Release the Redis connections"""
+    if REDIS is not None:
+        await REDIS.aclose()
+
+def cache_key(request: Request):
+    """Default cache key: the request path and query string"""
+    return f"tasks:{request.url.path}?{request.url.query}"
+
+def cached(ttl, key=cache_key, stream=False):
+    """Cache the responses of a GET endpoint in Redis for ttl seconds
+    
+    A key function returning None bypasses the cache for that request.
+    With stream=True a cold cache miss is sent to the client as it is produced
+    and stored once complete, at the cost of no ETag on that response.
+    """
+    def decorator(func):
+        func.cache_policy = (ttl, key, stream)
+        return func
+    return decorator
+
+def get_cache_policy(request: Request):
+    """Return the cache policy of the endpoint serving a request, if any"""
+    if request.method != "GET":
+        return None
+    for route in app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return getattr(route.endpoint, "cache_policy", None)
+    return None
+
+def make_etag(body):
+    """Weak ETag of a response body, weak because GZipMiddleware may re-encode it"""
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+def etag_matches(request: Request, etag):
+    """Whether the request's If-None-Match header covers etag"""
+    header = request.headers.get("if-none-match")
+    if not header or not etag:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+def cached_response(request: Request, entry, state):
+    """Build a response (or a 304) from a cached Redis entry"""
+    etag = entry.get(b"etag", b"").decode()
+    headers = {"X-Cache": state}
+    if etag:
+        headers["ETag"] = etag
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=entry[b"body"],
+        status_code=int(entry[b"status"]),
+        media_type="application/json",
+        headers=headers,
+    )
+
+async def store_response(key, ttl, body):
+    """Store a successful response body in Redis and return its ETag"""
+    now = time.time()
+    etag = make_etag(body)
+    try:
+        async with REDIS.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={
+                "generated_at": now,
+                "stale_after": now + ttl,
+                "body": body,
+                "status": 200,
+                "etag": etag,
+            })
+            pipe.expire(key, ttl + CACHE_STALE_BUFFER)
+            await pipe.execute()
+    except redis.RedisError as e:
+        logger.warning("Cache unavailable: %s", e)
+    return etag
+
+@app.middleware("http")
+async def cache_responses(request: Request, call_next):
+    """Serve cached responses and fall back to stale ones when the database fails
+    
+    Responses carry an ETag, except streamed cold misses; a matching
+    If-None-Match is answered with a 304.
+    """
+    policy = get_cache_policy(request)
+    if policy is None:
+        return await call_next(request)
+
+    ttl, key_func, stream = policy
+    key = key_func(request)
+    if key is None:
+        return await call_next(request)
+
+    try:
+        entry = await REDIS.hgetall(key)
+    except redis.RedisError as e:
+        logger.warning("Cache unavailable: %s", e)
+        entry = None
+
+    # Only a fresh entry skips the handler; an expired one is only served
+    # (or answered with a 304) when the handler fails
+    if entry and time.time() < float(entry[b"stale_after"]):
+        return cached_response(request, entry, "HIT")
+
+    response = await call_next(request)
+
+    # Only a cold miss is streamed: a client revalidating an ETag, or an
+    # expired entry that may be served stale, needs the buffered body hashed
+    cold = not entry and "if-none-match" not in request.headers
+    if response.status_code == 200 and stream and cold:
+        headers = dict(response.headers)
+        headers["X-Cache"] = "MISS"
+        chunks = []
+        complete = False
+
+        async def relay():
+            nonlocal complete
+            async for chunk in response.body_iterator:
+                chunks.append(chunk)
+                yield chunk
+            complete = True
+
+        async def store():
+            # A body cut short by a failure or a disconnect is not cached
+            if complete:
+                await store_response(key, ttl, b"".join(chunks))
+
+        return StreamingResponse(relay(), status_code=200, headers=headers, background=BackgroundTask(store))
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+
+    if response.status_code >= 500 and entry:
+        return cached_response(request, entry, "STALE")
+
+    headers = dict(response.headers)
+    headers["X-Cache"] = "MISS"
+
+    if response.status_code == 200:
+        etag = await store_response(key, ttl, body)
+        headers["ETag"] = etag
+
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers={"X-Cache": "MISS", "ETag": etag})
+
+    return Response(content=body, status_code=response.status_code, headers=headers)
+
+# Added after the cache middleware so it wraps it: cached bodies are stored
+# uncompressed and compressed per request according to Accept-Encoding
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 class TaskPermission(BaseModel):
     task_id: int
-    task_uuid: str
-    task_name: str
+    task_uuid: UUID
+    task_name: Optional[str] = None
+    processing_date: Optional[datetime] = None
+    days_since_processed: Optional[int] = None
+    task_status: Optional[int] = None
+    status_name: str
     project_id: int
     project_name: str
-    owner_username: str
-    permissions: str
+    probable_owner: str
     permission_count: int
+    permissions: str
     group_memberships: Optional[str] = None
 
 class TaskOwnershipResponse(BaseModel):
     tasks: List[TaskPermission]
+
+class TaskStatusEntry(BaseModel):
+    task_id: int
+    task_uuid: UUID
+    task_name: Optional[str] = None
+    task_status: Optional[int] = None
+    status_name: str
+    project_id: int
+    project_name: str
+    owner_username: str
+
+class TaskStatusResponse(BaseModel):
+    tasks: List[TaskStatusEntry]
+
+class TaskOwner(BaseModel):
+    task_id: int
+    task_uuid: UUID
+    task_name: Optional[str] = None
+    task_status: Optional[int] = None
+    status_name: str
+    project_id: int
+    project_name: str
+    owner_username: str
+    permissions: str
+    group_memberships: Optional[str] = None
+
+class TaskOwnersResponse(BaseModel):
+    tasks: List[TaskOwner]
     
 class TaskStatus(BaseModel):
     status_code: int
     status_name: str
     
+_STATUS_MAP = MappingProxyType({
+    10: "QUEUED",
+    20: "RUNNING",
+    30: "FAILED",
+    40: "COMPLETED",
+    50: "CANCELED",
+})
+
 def get_task_status_map():
-    """Returns a mapping of status codes to human-readable status names"""
-    return {
-        10: "QUEUED",
-        20: "RUNNING",
-        30: "FAILED",
-        40: "COMPLETED",
-        50: "CANCELED"
-    }
+    """Returns a read-only mapping of status codes to human-readable status names"""
+    return _STATUS_MAP
+
+# SQL counterpart of get_task_status_map(), lets Postgres label each row
+STATUS_CASE = (
+    "CASE t.status\n"
+    + "".join(f"        WHEN {code} THEN '{name}'\n" for code, name in _STATUS_MAP.items())
+    + "        ELSE 'Unknown (' || COALESCE(t.status::text, 'None') || ')'\n"
+    + "    END AS status_name"
+)
+
+# Endpoint SQL below is built once at import, with STATUS_CASE interpolated
+
+# Likely owners of each project with their permissions, counted per
+# (project, user) before tasks are joined. project_filter narrows the
+# projects aggregated by the per-task queries
+def owners_cte(project_filter=None):
+    """SQL of the owners CTE, restricted to the projects matching project_filter"""
+    where = f"    WHERE\n        {project_filter}\n" if project_filter else ""
+    return f"""owners AS (
+    SELECT 
+        puop.content_object_id AS project_id,
+        puop.user_id,
+        COUNT(DISTINCT perm.codename) AS permission_count,
+        string_agg(DISTINCT perm.codename, ', ') AS permissions
+    FROM 
+        app_projectuserobjectpermission puop
+    JOIN 
+        auth_permission perm ON puop.permission_id = perm.id
+{where}    GROUP BY 
+        puop.content_object_id, puop.user_id
+    HAVING 
+        COUNT(DISTINCT perm.codename) >= 4  -- Users with all permissions are likely owners
+)"""
+
+# Comma-separated group names of each user
+_USER_GROUPS_CTE = """user_groups AS (
+    SELECT 
+        ug.user_id,
+        string_agg(DISTINCT g.name, ', ') AS group_memberships
+    FROM 
+        auth_user_groups ug
+    JOIN 
+        auth_group g ON ug.group_id = g.id
+    GROUP BY 
+        ug.user_id
+)"""
+
+_OWNERSHIP_VIEW_SQL = """
+SELECT 
+    task_id,
+    task_uuid,
+    task_name,
+    processing_date,
+    EXTRACT(DAY FROM now() - processing_date)::int AS days_since_processed,
+    task_status,
+    status_name,
+    project_id,
+    project_name,
+    probable_owner,
+    permission_count,
+    permissions,
+    group_memberships
+FROM 
+    task_ownership_mv
+ORDER BY 
+    task_id, permission_count DESC;
+"""
+
+_OWNERSHIP_SQL = f"""
+WITH {owners_cte()},
+{_USER_GROUPS_CTE}
+SELECT 
+    t.id AS task_id,
+    t.uuid AS task_uuid,
+    t.name AS task_name,
+    t.created_at AS processing_date,
+    EXTRACT(DAY FROM now() - t.created_at)::int AS days_since_processed,
+    t.status AS task_status,
+    {STATUS_CASE},
+    p.id AS project_id,
+    p.name AS project_name,
+    u.username AS probable_owner,
+    o.permission_count,
+    o.permissions,
+    ug.group_memberships
+FROM 
+    app_task t
+JOIN 
+    app_project p ON t.project_id = p.id
+JOIN 
+    owners o ON o.project_id = p.id
+JOIN 
+    auth_user u ON o.user_id = u.id
+LEFT JOIN
+    user_groups ug ON ug.user_id = u.id
+ORDER BY 
+    t.id, o.permission_count DESC;
+"""
+
+_STATUS_SQL = f"""
+WITH {owners_cte()}
+SELECT 
+    t.id AS task_id,
+    t.uuid AS task_uuid,
+    t.name AS task_name,
+    t.status AS task_status,
+    {STATUS_CASE},
+    p.id AS project_id,
+    p.name AS project_name,
+    u.username AS owner_username
+FROM 
+    app_task t
+JOIN 
+    app_project p ON t.project_id = p.id
+JOIN 
+    owners o ON o.project_id = p.id
+JOIN 
+    auth_user u ON o.user_id = u.id
+ORDER BY 
+    t.id;
+"""
+
+# DISTINCT ON keeps the highest-permission owner of each task
+_OWNERS_SQL = f"""
+WITH {owners_cte("puop.content_object_id IN (SELECT project_id FROM app_task WHERE id = ANY(%(ids)s::bigint[]))")},
+{_USER_GROUPS_CTE}
+SELECT DISTINCT ON (t.id)
+    t.id AS task_id,
+    t.uuid AS task_uuid,
+    t.name AS task_name,
+    t.status AS task_status,
+    {STATUS_CASE},
+    p.id AS project_id,
+    p.name AS project_name,
+    u.username AS owner_username,
+    o.permissions,
+    ug.group_memberships
+FROM 
+    app_task t
+JOIN 
+    app_project p ON t.project_id = p.id
+JOIN 
+    owners o ON o.project_id = p.id
+JOIN 
+    auth_user u ON o.user_id = u.id
+LEFT JOIN
+    user_groups ug ON ug.user_id = u.id
+WHERE
+    t.id = ANY(%(ids)s::bigint[])
+ORDER BY 
+    t.id, o.permission_count DESC;
+"""
+
+# DISTINCT ON keeps the highest-permission owner of the task
+_OWNER_SQL = f"""
+WITH {owners_cte("puop.content_object_id = (SELECT project_id FROM app_task WHERE id = %(task_id)s)")},
+{_USER_GROUPS_CTE}
+SELECT DISTINCT ON (t.id)
+    t.id AS task_id,
+    t.uuid AS task_uuid,
+    t.name AS task_name,
+    t.status AS task_status,
+    {STATUS_CASE},
+    p.id AS project_id,
+    p.name AS project_name,
+    u.username AS owner_username,
+    o.permissions,
+    ug.group_memberships
+FROM 
+    app_task t
+JOIN 
+    app_project p ON t.project_id = p.id
+JOIN 
+    owners o ON o.project_id = p.id
+JOIN 
+    auth_user u ON o.user_id = u.id
+LEFT JOIN
+    user_groups ug ON ug.user_id = u.id
+WHERE
+    t.id = %(task_id)s
+ORDER BY 
+    t.id, o.permission_count DESC;
+"""
+
+# User details, direct permissions and group permissions in one round-trip
+_ACCESS_SQL = f"""
+WITH user_access AS (
+    SELECT 
+        t.id AS task_id,
+        t.name AS task_name,
+        t.status AS task_status,
+        {STATUS_CASE},
+        p.id AS project_id,
+        p.name AS project_name,
+        p.public AS is_public,
+        u.username,
+        u.is_superuser,
+        string_agg(DISTINCT perm.codename, ', ') AS direct_permissions,
+        string_agg(DISTINCT g.name, ', ') AS user_groups
+    FROM 
+        app_task t
+    JOIN 
+        app_project p ON t.project_id = p.id
+    JOIN 
+        auth_user u ON u.username = %(username)s
+    LEFT JOIN
+        app_projectuserobjectpermission puop ON puop.content_object_id = p.id AND puop.user_id = u.id
+    LEFT JOIN
+        auth_permission perm ON puop.permission_id = perm.id
+    LEFT JOIN
+        auth_user_groups ug ON u.id = ug.user_id
+    LEFT JOIN
+        auth_group g ON ug.group_id = g.id
+    WHERE
+        t.id = %(task_id)s
+    GROUP BY 
+        t.id, t.name, t.status, p.id, p.name, p.public, u.username, u.is_superuser
+),
+group_perms AS (
+    SELECT 
+        g.name AS group_name,
+        string_agg(DISTINCT perm.codename, ', ') AS group_permissions
+    FROM 
+        app_task t
+    JOIN 
+        app_project p ON t.project_id = p.id
+    JOIN 
+        app_projectgroupobjectpermission pgop ON pgop.content_object_id = p.id
+    JOIN 
+        auth_group g ON pgop.group_id = g.id
+    JOIN 
+        auth_permission perm ON pgop.permission_id = perm.id
+    WHERE
+        t.id = %(task_id)s AND g.name IN (
+            SELECT g.name FROM auth_user u
+            JOIN auth_user_groups ug ON u.id = ug.user_id
+            JOIN auth_group g ON ug.group_id = g.id
+            WHERE u.username = %(username)s
+        )
+    GROUP BY 
+        g.name
+)
+SELECT 
+    user_access.*,
+    (
+        SELECT json_agg(json_build_object(
+            'group_name', group_name,
+            'group_permissions', group_permissions
+        ) ORDER BY group_name)
+        FROM group_perms
+    ) AS group_permissions
+FROM 
+    user_access;
+"""
+
 
 @app.get("/")
 def read_root():
@@ -71,278 +627,134 @@ def read_root():
         "endpoints": [
             "/api/tasks/ownership",
             "/api/tasks/status",
+            "/api/tasks/owners?ids={task_id}&ids={task_id}",
             "/api/tasks/{task_id}/owner",
             "/api/tasks/{task_id}/check-access/{username}"
         ]
     }
 
 
-@app.get("/api/tasks/ownership")
-def get_task_ownership():
-    """Get all tasks with their ownership information including processing date and days elapsed"""
-    conn = None
+# Rows fetched from a server-side cursor per round-trip when streaming
+STREAM_BATCH_SIZE = 1000
+
+async def stream_tasks(conn, query, cursor_name):
+    """Stream the rows of a query as a {"tasks": [...]} JSON document"""
+    # Server-side cursors only exist inside a transaction
+    async with conn.transaction():
+        await use_listing_work_mem(conn)
+        async with conn.cursor(name=cursor_name, row_factory=dict_row) as cursor:
+            await cursor.execute(query)
+            yield b'{"tasks":['
+            separator = b""
+            while True:
+                rows = await cursor.fetchmany(STREAM_BATCH_SIZE)
+                if not rows:
+                    break
+                yield separator + b",".join(orjson.dumps(row) for row in rows)
+                separator = b","
+            yield b"]}"
+
+def ownership_cache_key(request: Request):
+    """Cache key of /api/tasks/ownership, None when fresh=true forces the live query"""
+    if request.query_params.get("fresh", "").lower() in ("1", "t", "true", "y", "yes", "on"):
+        return None
+    return cache_key(request)
+
+@app.get("/api/tasks/ownership", response_model=TaskOwnershipResponse)
+@cached(ttl=CACHE_TTL_NORMAL, key=ownership_cache_key, stream=True)
+async def get_task_ownership(fresh: bool = False, conn=Depends(get_conn)):
+    """Get all tasks with their ownership information including processing date and days elapsed
+    
+    Served from task_ownership_mv when it exists, unless fresh=true asks for the live query.
+    """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        query = """
-        SELECT 
-            t.id AS task_id,
-            t.uuid AS task_uuid,
-            t.name AS task_name,
-            t.created_at AS processing_date,
-            t.status AS task_status,
-            p.id AS project_id,
-            p.name AS project_name,
-            u.username AS probable_owner,
-            COUNT(DISTINCT perm.codename) AS permission_count,
-            string_agg(DISTINCT perm.codename, ', ') AS permissions,
-            string_agg(DISTINCT g.name, ', ') AS group_memberships
-        FROM 
-            app_task t
-        JOIN 
-            app_project p ON t.project_id = p.id
-        JOIN 
-            app_projectuserobjectpermission puop ON puop.content_object_id = p.id
-        JOIN 
-            auth_user u ON puop.user_id = u.id
-        JOIN 
-            auth_permission perm ON puop.permission_id = perm.id
-        LEFT JOIN
-            auth_user_groups ug ON u.id = ug.user_id
-        LEFT JOIN
-            auth_group g ON ug.group_id = g.id
-        GROUP BY 
-            t.id, t.uuid, t.name, t.created_at, t.status, p.id, p.name, u.username
-        HAVING 
-            COUNT(DISTINCT perm.codename) >= 4  -- Users with all permissions are likely owners
-        ORDER BY 
-            t.id, permission_count DESC;
-        """
-        
-        cursor.execute(query)
-        results = cursor.fetchall()
-        
-        status_map = get_task_status_map()
-        current_time = datetime.now(timezone.utc)
-        
-        # Add status name and days elapsed to each task
-        for task in results:
-            task["status_name"] = status_map.get(task["task_status"], f"Unknown ({task['task_status']})")
-            
-            # Calculate days elapsed since processing
-            if task["processing_date"]:
-                process_date = task["processing_date"]
-                if isinstance(process_date, str):
-                    process_date = datetime.fromisoformat(process_date.replace('Z', '+00:00'))
-                
-                elapsed = current_time - process_date
-                task["days_since_processed"] = elapsed.days
-            else:
-                task["days_since_processed"] = None
-        
-        return {"tasks": results}
+        query = _OWNERSHIP_VIEW_SQL if OWNERSHIP_VIEW_READY and not fresh else _OWNERSHIP_SQL
+        chunks = stream_tasks(conn, query, "ownership_cur")
+        # Run the query before responding so that failures still return a 500
+        head = await chunks.__anext__()
     
     except Exception as e:
-        print(f"Error: {e}")
+        logger.exception("Request handler failed")
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
-    finally:
-        if conn:
-            conn.close()
+    
+    async def body():
+        yield head
+        async for chunk in chunks:
+            yield chunk
+    
+    # get_conn only returns the connection to the pool once the body is sent
+    return StreamingResponse(body(), media_type="application/json")
 
 
-@app.get("/api/tasks/status")
-def get_task_status():
+@app.get("/api/tasks/status", response_model=TaskStatusResponse)
+@cached(ttl=CACHE_TTL_SHORT)
+async def get_task_status(conn=Depends(get_conn)):
     """Get all tasks with their processing status"""
-    conn = None
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        cursor = conn.cursor(row_factory=class_row(TaskStatusEntry))
         
-        query = """
-        SELECT 
-            t.id AS task_id,
-            t.uuid AS task_uuid,
-            t.name AS task_name,
-            t.status AS task_status,
-            p.id AS project_id,
-            p.name AS project_name,
-            u.username AS owner_username
-        FROM 
-            app_task t
-        JOIN 
-            app_project p ON t.project_id = p.id
-        JOIN 
-            app_projectuserobjectpermission puop ON puop.content_object_id = p.id
-        JOIN 
-            auth_user u ON puop.user_id = u.id
-        JOIN 
-            auth_permission perm ON puop.permission_id = perm.id
-        GROUP BY 
-            t.id, t.uuid, t.name, t.status, p.id, p.name, u.username
-        HAVING 
-            COUNT(DISTINCT perm.codename) >= 4  -- Users with all permissions are likely owners
-        ORDER BY 
-            t.id;
-        """
-        
-        cursor.execute(query)
-        results = cursor.fetchall()
-        
-        status_map = get_task_status_map()
-        
-        # Add status name to each task
-        for task in results:
-            task["status_name"] = status_map.get(task["task_status"], f"Unknown ({task['task_status']})")
+        # BEGIN, set_config and the query are sent in a single network flush
+        async with conn.pipeline():
+            async with conn.transaction():
+                await use_listing_work_mem(conn)
+                await cursor.execute(_STATUS_SQL)
+                return {"tasks": await cursor.fetchall()}
+    
+    except Exception as e:
+        logger.exception("Request handler failed")
+        raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
+
+@app.get("/api/tasks/owners", response_model=TaskOwnersResponse)
+@cached(ttl=CACHE_TTL_LONG)
+async def get_task_owners_batch(ids: List[int] = Query([]), conn=Depends(get_conn)):
+    """Get the owners of several tasks in a single query"""
+    if not ids:
+        raise HTTPException(status_code=422, detail="At least one task id is required")
+    try:
+        cursor = conn.cursor(row_factory=class_row(TaskOwner))
         
-        return {"tasks": results}
+        await cursor.execute(_OWNERS_SQL, {"ids": ids}, prepare=True)
+        return {"tasks": await cursor.fetchall()}
     
     except Exception as e:
-        print(f"Error: {e}")
+        logger.exception("Request handler failed")
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
-    finally:
-        if conn:
-            conn.close()
 
-@app.get("/api/tasks/{task_id}/owner")
-def get_task_owner(task_id: int):
+@app.get("/api/tasks/{task_id}/owner", response_model=TaskOwner)
+@cached(ttl=CACHE_TTL_LONG)
+async def get_task_owner(task_id: int, conn=Depends(get_conn)):
     """Get the owner of a specific task"""
-    conn = None
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        cursor = conn.cursor(row_factory=class_row(TaskOwner))
         
-        query = """
-        SELECT 
-            t.id AS task_id,
-            t.uuid AS task_uuid,
-            t.name AS task_name,
-            t.status AS task_status,
-            p.id AS project_id,
-            p.name AS project_name,
-            u.username AS owner_username,
-            string_agg(DISTINCT perm.codename, ', ') AS permissions,
-            string_agg(DISTINCT g.name, ', ') AS group_memberships
-        FROM 
-            app_task t
-        JOIN 
-            app_project p ON t.project_id = p.id
-        JOIN 
-            app_projectuserobjectpermission puop ON puop.content_object_id = p.id
-        JOIN 
-            auth_user u ON puop.user_id = u.id
-        JOIN 
-            auth_permission perm ON puop.permission_id = perm.id
-        LEFT JOIN
-            auth_user_groups ug ON u.id = ug.user_id
-        LEFT JOIN
-            auth_group g ON ug.group_id = g.id
-        WHERE
-            t.id = %s
-        GROUP BY 
-            t.id, t.uuid, t.name, t.status, p.id, p.name, u.username
-        HAVING 
-            COUNT(DISTINCT perm.codename) >= 4  -- Users with all permissions are likely owners
-        ORDER BY 
-            COUNT(DISTINCT perm.codename) DESC
-        LIMIT 1;
-        """
-        
-        cursor.execute(query, (task_id,))
-        result = cursor.fetchone()
+        await cursor.execute(_OWNER_SQL, {"task_id": task_id}, prepare=True)
+        result = await cursor.fetchone()
         
         if result is None:
             raise HTTPException(status_code=404, detail=f"Task {task_id} not found or has no owner")
         
-        # Add status name
-        status_map = get_task_status_map()
-        result["status_name"] = status_map.get(result["task_status"], f"Unknown ({result['task_status']})")
-        
         return result
     
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error: {e}")
+        logger.exception("Request handler failed")
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
-    finally:
-        if conn:
-            conn.close()
 
 @app.get("/api/tasks/{task_id}/check-access/{username}")
-def check_user_access_to_task(task_id: int, username: str):
+@cached(ttl=CACHE_TTL_SHORT)
+async def check_user_access_to_task(task_id: int, username: str, conn=Depends(get_conn)):
     """Check if a specific user has access to a task"""
-    conn = None
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        query = """
-        SELECT 
-            t.id AS task_id,
-            t.name AS task_name,
-            t.status AS task_status,
-            p.id AS project_id,
-            p.name AS project_name,
-            p.public AS is_public,
-            u.username,
-            u.is_superuser,
-            string_agg(DISTINCT perm.codename, ', ') AS direct_permissions,
-            string_agg(DISTINCT g.name, ', ') AS user_groups
-        FROM 
-            app_task t
-        JOIN 
-            app_project p ON t.project_id = p.id
-        JOIN 
-            auth_user u ON u.username = %s
-        LEFT JOIN
-            app_projectuserobjectpermission puop ON puop.content_object_id = p.id AND puop.user_id = u.id
-        LEFT JOIN
-            auth_permission perm ON puop.permission_id = perm.id
-        LEFT JOIN
-            auth_user_groups ug ON u.id = ug.user_id
-        LEFT JOIN
-            auth_group g ON ug.group_id = g.id
-        WHERE
-            t.id = %s
-        GROUP BY 
-            t.id, t.name, t.status, p.id, p.name, p.public, u.username, u.is_superuser;
-        """
+        cursor = conn.cursor(row_factory=dict_row)
         
-        cursor.execute(query, (username, task_id))
-        result = cursor.fetchone()
+        await cursor.execute(_ACCESS_SQL, {"task_id": task_id, "username": username}, prepare=True)
+        result = await cursor.fetchone()
         
         if result is None:
             raise HTTPException(status_code=404, detail=f"Task {task_id} or user {username} not found")
         
-        # Also fetch group permissions for this project
-        group_query = """
-        SELECT 
-            g.name AS group_name,
-            string_agg(DISTINCT perm.codename, ', ') AS group_permissions
-        FROM 
-            app_task t
-        JOIN 
-            app_project p ON t.project_id = p.id
-        JOIN 
-            app_projectgroupobjectpermission pgop ON pgop.content_object_id = p.id
-        JOIN 
-            auth_group g ON pgop.group_id = g.id
-        JOIN 
-            auth_permission perm ON pgop.permission_id = perm.id
-        WHERE
-            t.id = %s AND g.name IN (
-                SELECT g.name FROM auth_user u
-                JOIN auth_user_groups ug ON u.id = ug.user_id
-                JOIN auth_group g ON ug.group_id = g.id
-                WHERE u.username = %s
-            )
-        GROUP BY 
-            g.name;
-        """
-        
-        cursor.execute(group_query, (task_id, username))
-        group_results = cursor.fetchall()
+        group_results = result["group_permissions"] or []
         
         # Determine access level
         has_access = False
@@ -369,10 +781,6 @@ def check_user_access_to_task(task_id: int, username: str):
         if group_permissions:
             access_type.append(f"group permissions: {', '.join(group_permissions)}")
         
-        # Add status name
-        status_map = get_task_status_map()
-        result["status_name"] = status_map.get(result["task_status"], f"Unknown ({result['task_status']})")
-        
         return {
             "task_id": result["task_id"],
             "task_name": result["task_name"],
@@ -391,13 +799,32 @@ def check_user_access_to_task(task_id: int, username: str):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error: {e}")
+        logger.exception("Request handler failed")
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
-    finally:
-        if conn:
-            conn.close()
+
+def configure_logging():
+    """Route all log records, uvicorn's included, through a queue
+    
+    The handler writing to stderr runs on the listener's thread, so emitting
+    a record never blocks the event loop.
+    """
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    listener = QueueListener(log_queue, stream_handler)
+
+    root = logging.getLogger()
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    root.addHandler(QueueHandler(log_queue))
+    listener.start()
+    return listener
 
 if __name__ == "__main__":
-    print(f"Starting WebODM Task Ownership API")
-    print(f"Database connection parameters: {DB_PARAMS}")
-    uvicorn.run(app, host="0.0.0.0", port=8080)
+    listener = configure_logging()
+    logger.info("Starting WebODM Task Ownership API")
+    logger.info("Database connection parameters: %s", DB_PARAMS | {"password": "***"})
+    try:
+        # log_config=None leaves uvicorn's loggers propagating to the root logger
+        uvicorn.run(app, host="0.0.0.0", port=8080, log_config=None)
+    finally:
+        listener.stop()